@@ -28,6 +28,7 @@ def model(dbt, session):
     """
     import pandas as pd
     import numpy as np
+    import pyarrow as pa
     
     # Configuration
     dbt.config(
@@ -35,108 +36,113 @@ def model(dbt, session):
         tags=['python', 'anomaly_detection', 'data_quality']
     )
     
-    # Load upstream model
-    monthly_df = dbt.ref('fct_economic_indicators').df()
+    # Load upstream model, letting DuckDB prune columns and order rows
+    # chronologically per country before converting
+    upstream = (
+        dbt.ref('fct_economic_indicators')
+        .project(
+            'indicator_key, country_code, '
+            'cast(reference_date as timestamp) as reference_date, reference_year, '
+            'reference_month, unemployment_rate_pct, inflation_rate_mom_pct'
+        )
+        .order('country_code, reference_date')
+    )
+    
+    # Convert via Arrow so string columns (country_code) stay Arrow-backed
+    # instead of becoming Python objects; reference_date is cast to
+    # TIMESTAMP above so it arrives as datetime64[us], as with .df()
+    monthly_df = pa.table(upstream.arrow()).to_pandas(
+        types_mapper={pa.string(): pd.ArrowDtype(pa.string())}.get,
+        date_as_object=False,
+        self_destruct=True
+    )
     
     # Define thresholds
     Z_SCORE_THRESHOLD = 3.0
     IQR_MULTIPLIER = 1.5
     RATE_OF_CHANGE_THRESHOLD = 0.5  # 50% change month-over-month
     
-    def calculate_z_scores(series: pd.Series) -> pd.Series:
-        """Calculate z-scores for a series."""
-        mean = series.mean()
-        std = series.std()
-        if std == 0 or pd.isna(std):
-            return pd.Series(0, index=series.index)
-        return (series - mean) / std
-    
-    def detect_iqr_outliers(series: pd.Series) -> pd.Series:
-        """Detect outliers using IQR method."""
-        q1 = series.quantile(0.25)
-        q3 = series.quantile(0.75)
+    # Every per-country computation below runs as a single vectorized
+    # groupby pass over the already ordered rows
+    grp = monthly_df.groupby('country_code', sort=False)
+    
+    def calculate_z_scores(col: str) -> pd.Series:
+        """Calculate country-specific z-scores for a column."""
+        mean = grp[col].transform('mean')
+        std = grp[col].transform('std')
+        z_scores = (monthly_df[col] - mean) / std.replace(0, np.nan)
+        return z_scores.mask(std == 0, 0.0)
+    
+    def detect_iqr_outliers(col: str) -> pd.Series:
+        """Detect outliers using the country-specific IQR method."""
+        # Both quartiles from one quantile pass per country, mapped back to rows
+        quartiles = grp[col].quantile([0.25, 0.75]).unstack()
+        q1 = monthly_df['country_code'].map(quartiles[0.25])
+        q3 = monthly_df['country_code'].map(quartiles[0.75])
         iqr = q3 - q1
         lower_bound = q1 - IQR_MULTIPLIER * iqr
         upper_bound = q3 + IQR_MULTIPLIER * iqr
-        return (series < lower_bound) | (series > upper_bound)
+        return (monthly_df[col] < lower_bound) | (monthly_df[col] > upper_bound)
     
-    def detect_rate_of_change_anomalies(series: pd.Series, threshold: float) -> pd.Series:
-        """Detect anomalous rate of change."""
-        pct_change = series.pct_change().abs()
-        return pct_change > threshold
+    # First row of each country's series has no previous month to compare
+    country_ids = pd.factorize(monthly_df['country_code'])[0]
+    series_start = np.diff(country_ids, prepend=-1) != 0
     
-    # Process each country separately for country-specific anomalies
-    results = []
-    
-    for country_code in monthly_df['country_code'].unique():
-        country_data = monthly_df[monthly_df['country_code'] == country_code].copy()
-        country_data = country_data.sort_values('reference_date')
+    def detect_rate_of_change_anomalies(col: str, threshold: float) -> pd.Series:
+        """Detect anomalous month-over-month rate of change."""
+        values = monthly_df[col].to_numpy()
         
-        # Unemployment anomaly detection
-        if 'unemployment_rate_pct' in country_data.columns:
-            unemp = country_data['unemployment_rate_pct'].dropna()
-            if len(unemp) > 10:  # Need sufficient data
-                country_data['unemployment_z_score'] = calculate_z_scores(
-                    country_data['unemployment_rate_pct']
-                )
-                country_data['unemployment_iqr_outlier'] = detect_iqr_outliers(
-                    country_data['unemployment_rate_pct']
-                )
-                country_data['unemployment_roc_anomaly'] = detect_rate_of_change_anomalies(
-                    country_data['unemployment_rate_pct'],
-                    RATE_OF_CHANGE_THRESHOLD
-                )
-            else:
-                country_data['unemployment_z_score'] = np.nan
-                country_data['unemployment_iqr_outlier'] = False
-                country_data['unemployment_roc_anomaly'] = False
+        # |x_t / x_(t-1) - 1| computed in place over the whole ordered column
+        pct_change = np.empty_like(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(values[1:], values[:-1], out=pct_change[1:])
+        np.subtract(pct_change[1:], 1.0, out=pct_change[1:])
+        np.abs(pct_change, out=pct_change)
+        pct_change[series_start] = np.nan
         
-        # Inflation anomaly detection
-        if 'inflation_rate_mom_pct' in country_data.columns:
-            infl = country_data['inflation_rate_mom_pct'].dropna()
-            if len(infl) > 10:
-                country_data['inflation_z_score'] = calculate_z_scores(
-                    country_data['inflation_rate_mom_pct']
-                )
-                country_data['inflation_iqr_outlier'] = detect_iqr_outliers(
-                    country_data['inflation_rate_mom_pct']
-                )
-                country_data['inflation_roc_anomaly'] = detect_rate_of_change_anomalies(
-                    country_data['inflation_rate_mom_pct'],
-                    RATE_OF_CHANGE_THRESHOLD
-                )
-            else:
-                country_data['inflation_z_score'] = np.nan
-                country_data['inflation_iqr_outlier'] = False
-                country_data['inflation_roc_anomaly'] = False
+        return pd.Series(pct_change > threshold, index=monthly_df.index)
+    
+    indicators = {
+        'unemployment': 'unemployment_rate_pct',
+        'inflation': 'inflation_rate_mom_pct',
+    }
+    
+    # Preallocate typed output columns: countries without enough history keep
+    # NaN z-scores and False flags, and flags stay 1-byte bools throughout
+    n_rows = len(monthly_df)
+    for prefix in indicators:
+        monthly_df[f'{prefix}_z_score'] = np.full(n_rows, np.nan, dtype=np.float64)
+        monthly_df[f'{prefix}_iqr_outlier'] = np.zeros(n_rows, dtype=bool)
+        monthly_df[f'{prefix}_roc_anomaly'] = np.zeros(n_rows, dtype=bool)
+    
+    for prefix, col in indicators.items():
+        # Need sufficient data per country
+        has_history = grp[col].transform('count') > 10
         
-        results.append(country_data)
-    
-    # Combine results
-    result_df = pd.concat(results, ignore_index=True)
-    
-    # Create composite anomaly flag
-    result_df['is_unemployment_anomaly'] = (
-        (result_df['unemployment_z_score'].abs() > Z_SCORE_THRESHOLD) |
-        result_df['unemployment_iqr_outlier'] |
-        result_df['unemployment_roc_anomaly']
-    ).fillna(False)
-    
-    result_df['is_inflation_anomaly'] = (
-        (result_df['inflation_z_score'].abs() > Z_SCORE_THRESHOLD) |
-        result_df['inflation_iqr_outlier'] |
-        result_df['inflation_roc_anomaly']
-    ).fillna(False)
-    
-    result_df['is_any_anomaly'] = (
-        result_df['is_unemployment_anomaly'] | 
-        result_df['is_inflation_anomaly']
+        monthly_df.loc[has_history, f'{prefix}_z_score'] = calculate_z_scores(col)
+        monthly_df.loc[has_history, f'{prefix}_iqr_outlier'] = detect_iqr_outliers(col)
+        monthly_df.loc[has_history, f'{prefix}_roc_anomaly'] = (
+            detect_rate_of_change_anomalies(col, RATE_OF_CHANGE_THRESHOLD)
+        )
+    
+    # Create composite anomaly flags; every input is a plain bool buffer, so
+    # the OR is a single bitwise reduction with no NaN handling
+    for prefix in indicators:
+        monthly_df[f'is_{prefix}_anomaly'] = np.bitwise_or.reduce([
+            np.abs(monthly_df[f'{prefix}_z_score'].to_numpy()) > Z_SCORE_THRESHOLD,
+            monthly_df[f'{prefix}_iqr_outlier'].to_numpy(),
+            monthly_df[f'{prefix}_roc_anomaly'].to_numpy(),
+        ])
+    
+    monthly_df['is_any_anomaly'] = np.bitwise_or(
+        monthly_df['is_unemployment_anomaly'].to_numpy(),
+        monthly_df['is_inflation_anomaly'].to_numpy()
     )
     
     # Calculate anomaly severity score (0-100)
-    result_df['anomaly_severity_score'] = (
-        result_df['unemployment_z_score'].abs().fillna(0).clip(0, 5) * 10 +
-        result_df['inflation_z_score'].abs().fillna(0).clip(0, 5) * 10
+    monthly_df['anomaly_severity_score'] = (
+        monthly_df['unemployment_z_score'].abs().fillna(0).clip(0, 5) * 10 +
+        monthly_df['inflation_z_score'].abs().fillna(0).clip(0, 5) * 10
     ).clip(0, 100)
     
     # Select output columns
@@ -156,7 +162,4 @@ def model(dbt, session):
         'anomaly_severity_score'
     ]
     
-    # Filter to columns that exist
-    output_columns = [c for c in output_columns if c in result_df.columns]
-    
-    return result_df[output_columns]
+    return monthly_df[output_columns]
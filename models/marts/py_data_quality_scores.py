@@ -22,6 +22,7 @@ def model(dbt, session):
     """
     import pandas as pd
     import numpy as np
+    import pyarrow as pa
     from datetime import datetime, timedelta
     
     # Configuration
@@ -30,9 +31,24 @@ def model(dbt, session):
         tags=['python', 'data_quality', 'monitoring']
     )
     
-    # Load upstream data
-    monthly_df = dbt.ref('fct_economic_indicators').df()
-    annual_df = dbt.ref('rpt_annual_economic_summary').df()
+    # Single run timestamp shared by recency scoring and output metadata
+    RUN_TIMESTAMP = datetime.now()
+    
+    # Load upstream data in country/date order for the repeated-value check
+    upstream = (
+        dbt.ref('fct_economic_indicators')
+        .project(
+            'country_code, cast(reference_date as timestamp) as reference_date, '
+            'unemployment_rate_pct, inflation_rate_mom_pct'
+        )
+        .order('country_code, reference_date')
+    )
+    
+    monthly_df = pa.table(upstream.arrow()).to_pandas(
+        types_mapper={pa.string(): pd.ArrowDtype(pa.string())}.get,
+        date_as_object=False,
+        self_destruct=True
+    )
     
     # Quality thresholds
     EXPECTED_UNEMPLOYMENT_MIN = 0.0
@@ -41,198 +57,177 @@ def model(dbt, session):
     EXPECTED_INFLATION_MAX = 20.0
     TIMELINESS_THRESHOLD_DAYS = 90
     
-    def calculate_completeness(df: pd.DataFrame, columns: list) -> dict:
-        """Calculate completeness score for specified columns."""
-        scores = {}
-        for col in columns:
-            if col in df.columns:
-                non_null_pct = df[col].notna().mean() * 100
-                scores[f'{col}_completeness'] = non_null_pct
-        
-        # Overall completeness
-        if scores:
-            scores['overall_completeness'] = np.mean(list(scores.values()))
-        else:
-            scores['overall_completeness'] = 0.0
+    indicators = {
+        'unemployment': ('unemployment_rate_pct', EXPECTED_UNEMPLOYMENT_MIN, EXPECTED_UNEMPLOYMENT_MAX),
+        'inflation': ('inflation_rate_mom_pct', EXPECTED_INFLATION_MIN, EXPECTED_INFLATION_MAX),
+    }
+    
+    # Precompute row-level flags on the full frame so all countries are
+    # aggregated in a single groupby pass; the key columns are referenced,
+    # not copied, since they are only read
+    flags = pd.DataFrame(
+        {
+            'country_code': monthly_df['country_code'],
+            'reference_date': monthly_df['reference_date'],
+        },
+        copy=False
+    )
+    agg_spec = {
+        'total_records': ('reference_date', 'size'),
+        'latest_data_date': ('reference_date', 'max'),
+    }
+    
+    # Integer country ids let neighbouring rows be compared without strings
+    country_ids = pd.factorize(monthly_df['country_code'])[0]
+    
+    for prefix, (col, lower, upper) in indicators.items():
+        values = monthly_df[col].to_numpy()
+        non_null = ~np.isnan(values)
+        
+        flags[f'{prefix}_non_null'] = non_null
+        flags[f'{prefix}_valid'] = (values >= lower) & (values <= upper)
+        
+        # Consecutive identical months (ignoring gaps) within each country
+        present = np.flatnonzero(non_null)
+        present_values = values[present]
+        present_ids = country_ids[present]
+        repeated = np.zeros(len(values), dtype=bool)
+        repeated[present[1:]] = (
+            (np.diff(present_values) == 0) & (present_ids[1:] == present_ids[:-1])
+        )
+        flags[f'{prefix}_repeated'] = repeated
         
+        agg_spec[f'{prefix}_non_null'] = (f'{prefix}_non_null', 'sum')
+        agg_spec[f'{prefix}_valid'] = (f'{prefix}_valid', 'sum')
+        agg_spec[f'{prefix}_repeated'] = (f'{prefix}_repeated', 'sum')
+    
+    stats = flags.groupby('country_code', sort=False).agg(**agg_spec)
+    
+    def calculate_completeness(stats: pd.DataFrame) -> pd.DataFrame:
+        """Calculate completeness scores (percentage of non-null values)."""
+        scores = pd.DataFrame(index=stats.index)
+        for prefix in indicators:
+            scores[f'{prefix}_completeness'] = (
+                stats[f'{prefix}_non_null'] / stats['total_records'] * 100
+            )
+        scores['overall_completeness'] = scores.mean(axis=1)
         return scores
     
-    def calculate_timeliness(df: pd.DataFrame, date_col: str) -> dict:
+    def calculate_timeliness(stats: pd.DataFrame) -> pd.DataFrame:
         """Calculate timeliness score based on data recency."""
-        if date_col not in df.columns:
-            return {'timeliness_score': 0.0, 'days_since_latest': None}
-        
-        latest_date = pd.to_datetime(df[date_col]).max()
-        if pd.isna(latest_date):
-            return {'timeliness_score': 0.0, 'days_since_latest': None}
-        
-        days_since_latest = (datetime.now() - latest_date).days
+        latest_date = stats['latest_data_date']
+        days_since_latest = (
+            (np.datetime64(RUN_TIMESTAMP.date(), 'D') - latest_date.to_numpy()) // np.timedelta64(1, 'D')
+        )
         
-        # Score: 100 if within threshold, decreasing after
-        if days_since_latest <= TIMELINESS_THRESHOLD_DAYS:
-            timeliness_score = 100.0
-        else:
-            # Decay by 10 points per month after threshold
-            months_late = (days_since_latest - TIMELINESS_THRESHOLD_DAYS) / 30
-            timeliness_score = max(0, 100 - months_late * 10)
+        # Score: 100 if within threshold, then decay by 10 points per month
+        months_late = (days_since_latest - TIMELINESS_THRESHOLD_DAYS) / 30
+        timeliness_score = np.where(
+            days_since_latest <= TIMELINESS_THRESHOLD_DAYS,
+            100.0,
+            np.maximum(0, 100 - months_late * 10)
+        )
         
-        return {
+        return pd.DataFrame({
             'timeliness_score': timeliness_score,
             'days_since_latest': days_since_latest,
-            'latest_data_date': latest_date
-        }
+            'latest_data_date': latest_date,
+        }, index=stats.index)
     
-    def calculate_validity(df: pd.DataFrame) -> dict:
+    def calculate_validity(stats: pd.DataFrame) -> pd.DataFrame:
         """Calculate validity score based on expected value ranges."""
-        validity_scores = {}
-        
-        # Unemployment validity
-        if 'unemployment_rate_pct' in df.columns:
-            unemp = df['unemployment_rate_pct'].dropna()
-            if len(unemp) > 0:
-                valid_pct = (
-                    (unemp >= EXPECTED_UNEMPLOYMENT_MIN) & 
-                    (unemp <= EXPECTED_UNEMPLOYMENT_MAX)
-                ).mean() * 100
-                validity_scores['unemployment_validity'] = valid_pct
-        
-        # Inflation validity
-        if 'inflation_rate_mom_pct' in df.columns:
-            infl = df['inflation_rate_mom_pct'].dropna()
-            if len(infl) > 0:
-                valid_pct = (
-                    (infl >= EXPECTED_INFLATION_MIN) & 
-                    (infl <= EXPECTED_INFLATION_MAX)
-                ).mean() * 100
-                validity_scores['inflation_validity'] = valid_pct
-        
-        # Overall validity
-        if validity_scores:
-            validity_scores['overall_validity'] = np.mean(list(validity_scores.values()))
-        else:
-            validity_scores['overall_validity'] = 100.0
-        
-        return validity_scores
+        scores = pd.DataFrame(index=stats.index)
+        for prefix in indicators:
+            # NaN when a country has no values for this indicator
+            scores[f'{prefix}_validity'] = (
+                stats[f'{prefix}_valid'] / stats[f'{prefix}_non_null'] * 100
+            )
+        scores['overall_validity'] = scores.mean(axis=1).fillna(100.0)
+        return scores
     
-    def calculate_consistency(df: pd.DataFrame) -> dict:
+    def calculate_consistency(stats: pd.DataFrame) -> pd.DataFrame:
         """Calculate consistency score based on data patterns."""
-        consistency_scores = {}
-        
-        # Check for suspicious patterns (e.g., too many repeated values)
-        if 'unemployment_rate_pct' in df.columns:
-            unemp = df['unemployment_rate_pct'].dropna()
-            if len(unemp) > 10:
-                # Count consecutive identical values
-                consecutive_same = (unemp.diff() == 0).sum()
-                pct_repeated = consecutive_same / len(unemp) * 100
-                # High repetition is suspicious
-                consistency_scores['unemployment_consistency'] = max(0, 100 - pct_repeated * 2)
-        
-        if 'inflation_rate_mom_pct' in df.columns:
-            infl = df['inflation_rate_mom_pct'].dropna()
-            if len(infl) > 10:
-                consecutive_same = (infl.diff() == 0).sum()
-                pct_repeated = consecutive_same / len(infl) * 100
-                consistency_scores['inflation_consistency'] = max(0, 100 - pct_repeated * 2)
-        
-        if consistency_scores:
-            consistency_scores['overall_consistency'] = np.mean(list(consistency_scores.values()))
-        else:
-            consistency_scores['overall_consistency'] = 100.0
-        
-        return consistency_scores
+        scores = pd.DataFrame(index=stats.index)
+        for prefix in indicators:
+            # High repetition is suspicious; only scored with sufficient data
+            pct_repeated = stats[f'{prefix}_repeated'] / stats[f'{prefix}_non_null'] * 100
+            scores[f'{prefix}_consistency'] = (
+                (100 - pct_repeated * 2).clip(lower=0)
+                .where(stats[f'{prefix}_non_null'] > 10)
+            )
+        scores['overall_consistency'] = scores.mean(axis=1).fillna(100.0)
+        return scores
     
-    # Process each country
-    quality_scores = []
+    # Calculate scores for each dimension
+    completeness = calculate_completeness(stats)
+    timeliness = calculate_timeliness(stats)
+    validity = calculate_validity(stats)
+    consistency = calculate_consistency(stats)
     
-    for country_code in monthly_df['country_code'].unique():
-        country_data = monthly_df[monthly_df['country_code'] == country_code].copy()
-        
-        # Calculate scores for each dimension
-        completeness = calculate_completeness(
-            country_data, 
-            ['unemployment_rate_pct', 'inflation_rate_mom_pct']
-        )
-        
-        timeliness = calculate_timeliness(country_data, 'reference_date')
-        validity = calculate_validity(country_data)
-        consistency = calculate_consistency(country_data)
-        
-        # Calculate overall quality score (weighted average)
-        weights = {
-            'completeness': 0.30,
-            'timeliness': 0.25,
-            'validity': 0.25,
-            'consistency': 0.20
-        }
-        
-        overall_score = (
-            weights['completeness'] * completeness.get('overall_completeness', 0) +
-            weights['timeliness'] * timeliness.get('timeliness_score', 0) +
-            weights['validity'] * validity.get('overall_validity', 0) +
-            weights['consistency'] * consistency.get('overall_consistency', 0)
-        )
-        
-        # Determine quality grade
-        if overall_score >= 90:
-            quality_grade = 'A'
-        elif overall_score >= 80:
-            quality_grade = 'B'
-        elif overall_score >= 70:
-            quality_grade = 'C'
-        elif overall_score >= 60:
-            quality_grade = 'D'
-        else:
-            quality_grade = 'F'
-        
-        # Build record
-        record = {
-            'country_code': country_code,
-            'total_records': len(country_data),
-            
-            # Completeness
-            'completeness_score': completeness.get('overall_completeness', 0),
-            'unemployment_completeness': completeness.get('unemployment_rate_pct_completeness', 0),
-            'inflation_completeness': completeness.get('inflation_rate_mom_pct_completeness', 0),
-            
-            # Timeliness
-            'timeliness_score': timeliness.get('timeliness_score', 0),
-            'days_since_latest_data': timeliness.get('days_since_latest'),
-            'latest_data_date': timeliness.get('latest_data_date'),
-            
-            # Validity
-            'validity_score': validity.get('overall_validity', 0),
-            'unemployment_validity': validity.get('unemployment_validity', 0),
-            'inflation_validity': validity.get('inflation_validity', 0),
-            
-            # Consistency
-            'consistency_score': consistency.get('overall_consistency', 0),
-            
-            # Overall
-            'overall_quality_score': overall_score,
-            'quality_grade': quality_grade,
-            
-            # Metadata
-            'scored_at': datetime.now(),
-            'scoring_model_version': '1.0.0'
-        }
-        
-        quality_scores.append(record)
+    # Calculate overall quality score (weighted average)
+    weights = {
+        'completeness': 0.30,
+        'timeliness': 0.25,
+        'validity': 0.25,
+        'consistency': 0.20
+    }
+    
+    overall_score = (
+        weights['completeness'] * completeness['overall_completeness'] +
+        weights['timeliness'] * timeliness['timeliness_score'] +
+        weights['validity'] * validity['overall_validity'] +
+        weights['consistency'] * consistency['overall_consistency']
+    )
+    
+    # Determine quality grade
+    quality_grade = np.select(
+        [overall_score >= 90, overall_score >= 80, overall_score >= 70, overall_score >= 60],
+        ['A', 'B', 'C', 'D'],
+        default='F'
+    )
     
-    # Create DataFrame
-    result_df = pd.DataFrame(quality_scores)
+    result_df = pd.DataFrame({
+        'country_code': stats.index,
+        'total_records': stats['total_records'].to_numpy(),
+        
+        # Completeness
+        'completeness_score': completeness['overall_completeness'].to_numpy(),
+        'unemployment_completeness': completeness['unemployment_completeness'].to_numpy(),
+        'inflation_completeness': completeness['inflation_completeness'].to_numpy(),
+        
+        # Timeliness
+        'timeliness_score': timeliness['timeliness_score'].to_numpy(),
+        'days_since_latest_data': timeliness['days_since_latest'].to_numpy(),
+        'latest_data_date': timeliness['latest_data_date'].to_numpy(),
+        
+        # Validity
+        'validity_score': validity['overall_validity'].to_numpy(),
+        'unemployment_validity': validity['unemployment_validity'].fillna(0).to_numpy(),
+        'inflation_validity': validity['inflation_validity'].fillna(0).to_numpy(),
+        
+        # Consistency
+        'consistency_score': consistency['overall_consistency'].to_numpy(),
+        
+        # Overall
+        'overall_quality_score': overall_score.to_numpy(),
+        'quality_grade': quality_grade,
+        
+        # Metadata
+        'scored_at': RUN_TIMESTAMP,
+        'scoring_model_version': '1.0.0'
+    })
     
     # Add quality improvement recommendations
     if len(result_df) > 0:
-        result_df['primary_issue'] = result_df.apply(
-            lambda row: (
-                'completeness' if row['completeness_score'] < 80 else
-                'timeliness' if row['timeliness_score'] < 80 else
-                'validity' if row['validity_score'] < 80 else
-                'consistency' if row['consistency_score'] < 80 else
-                'none'
-            ),
-            axis=1
+        result_df['primary_issue'] = np.select(
+            [
+                result_df['completeness_score'] < 80,
+                result_df['timeliness_score'] < 80,
+                result_df['validity_score'] < 80,
+                result_df['consistency_score'] < 80,
+            ],
+            ['completeness', 'timeliness', 'validity', 'consistency'],
+            default='none'
         )
         
         result_df['requires_attention'] = result_df['overall_quality_score'] < 70
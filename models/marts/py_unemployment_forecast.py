@@ -23,6 +23,7 @@ def model(dbt, session):
     """
     import pandas as pd
     import numpy as np
+    import pyarrow as pa
     from datetime import datetime, timedelta
     
     # Configuration
@@ -31,25 +32,42 @@ def model(dbt, session):
         tags=['python', 'forecasting', 'ml']
     )
     
-    # Load upstream data
-    monthly_df = dbt.ref('fct_economic_indicators').df()
+    # Single run timestamp for every forecast row
+    RUN_TIMESTAMP = datetime.now()
+    
+    # Only months with a reading, in chronological order per country
+    upstream = (
+        dbt.ref('fct_economic_indicators')
+        .project(
+            'country_code, cast(reference_date as timestamp) as reference_date, '
+            'unemployment_rate_pct'
+        )
+        .filter('unemployment_rate_pct is not null')
+        .order('country_code, reference_date')
+    )
+    
+    monthly_df = pa.table(upstream.arrow()).to_pandas(
+        types_mapper={pa.string(): pd.ArrowDtype(pa.string())}.get,
+        date_as_object=False,
+        self_destruct=True
+    )
     
     # Forecast parameters
     FORECAST_HORIZON = 6  # months
     MIN_HISTORY_MONTHS = 24  # Minimum data points required
     
-    def exponential_smoothing(series: pd.Series, alpha: float = 0.3) -> float:
+    # Only countries with enough history are forecast
+    n_obs = monthly_df.groupby('country_code', sort=False)['reference_date'].transform('size')
+    history = monthly_df[n_obs >= MIN_HISTORY_MONTHS]
+    grp = history.groupby('country_code', sort=False)
+    
+    def exponential_smoothing(alpha: float = 0.3) -> pd.Series:
         """
-        Simple exponential smoothing for next period forecast.
+        Simple exponential smoothing for next period forecast, per country.
         """
-        if len(series) < 2:
-            return series.iloc[-1] if len(series) > 0 else np.nan
-        
-        result = series.iloc[0]
-        for value in series.iloc[1:]:
-            result = alpha * value + (1 - alpha) * result
-        
-        return result
+        # adjust=False gives the recursive form: s_t = alpha * x_t + (1 - alpha) * s_(t-1)
+        smoothed = grp['unemployment_rate_pct'].ewm(alpha=alpha, adjust=False).mean()
+        return smoothed.groupby(level='country_code', sort=False).last()
     
     def holt_linear_trend(series: pd.Series, alpha: float = 0.3, beta: float = 0.1) -> tuple:
         """
@@ -59,137 +77,121 @@ def model(dbt, session):
         if len(series) < 3:
             return series.iloc[-1] if len(series) > 0 else np.nan, 0
         
+        values = series.to_numpy(dtype=np.float64).tolist()
+        
         # Initialize
-        level = series.iloc[0]
-        trend = series.iloc[1] - series.iloc[0]
+        level = values[0]
+        trend = values[1] - values[0]
         
         # Update
-        for value in series.iloc[1:]:
+        for value in values[1:]:
             last_level = level
             level = alpha * value + (1 - alpha) * (level + trend)
             trend = beta * (level - last_level) + (1 - beta) * trend
         
         return level, trend
     
-    def linear_regression_forecast(series: pd.Series, periods_ahead: int) -> list:
+    def linear_regression() -> pd.DataFrame:
         """
-        Simple linear regression for trend extrapolation.
+        Least-squares linear trend per country (x = month index).
+        Returns slope and intercept for extrapolation.
         """
-        if len(series) < 3:
-            return [series.iloc[-1] if len(series) > 0 else np.nan] * periods_ahead
-        
-        x = np.arange(len(series))
-        y = series.values
-        
-        # Remove NaN
-        mask = ~np.isnan(y)
-        x = x[mask]
-        y = y[mask]
-        
-        if len(x) < 3:
-            return [series.dropna().iloc[-1] if len(series.dropna()) > 0 else np.nan] * periods_ahead
-        
-        # Fit linear regression
-        n = len(x)
-        x_mean = x.mean()
-        y_mean = y.mean()
-        
-        slope = np.sum((x - x_mean) * (y - y_mean)) / np.sum((x - x_mean) ** 2)
-        intercept = y_mean - slope * x_mean
-        
-        # Forecast
-        future_x = np.arange(len(series), len(series) + periods_ahead)
-        forecasts = intercept + slope * future_x
-        
-        return forecasts.tolist()
+        x = grp.cumcount().astype(np.float64)
+        y = history['unemployment_rate_pct']
+        
+        sums = pd.DataFrame({
+            'country_code': history['country_code'],
+            'x': x,
+            'y': y,
+            'xx': x * x,
+            'xy': x * y,
+        }).groupby('country_code', sort=False).sum()
+        
+        n = grp.size()
+        slope = (n * sums['xy'] - sums['x'] * sums['y']) / (n * sums['xx'] - sums['x'] ** 2)
+        intercept = (sums['y'] - slope * sums['x']) / n
+        
+        return pd.DataFrame({'slope': slope, 'intercept': intercept})
     
-    def calculate_prediction_interval(historical_values: pd.Series, forecast: float, confidence: float = 0.95) -> tuple:
+    def prediction_interval_margin(confidence: float = 0.95) -> pd.Series:
         """
-        Calculate prediction interval based on historical volatility.
+        Calculate prediction interval half-width from historical volatility.
         """
-        if len(historical_values) < 5:
-            return forecast - 1, forecast + 1
-        
-        # Use standard deviation of recent changes
-        changes = historical_values.diff().dropna()
-        std = changes.std()
+        # Use standard deviation of month-over-month changes
+        changes = grp['unemployment_rate_pct'].diff()
+        std = changes.groupby(history['country_code'], sort=False).std()
         
         # Z-score for confidence level (approximately)
         z = 1.96 if confidence == 0.95 else 1.645
         
-        margin = z * std * np.sqrt(1 + 1/len(historical_values))
-        
-        return forecast - margin, forecast + margin
-    
-    # Process each country
-    forecasts = []
+        return z * std * np.sqrt(1 + 1 / grp.size())
     
-    for country_code in monthly_df['country_code'].unique():
-        country_data = monthly_df[monthly_df['country_code'] == country_code].copy()
-        country_data = country_data.sort_values('reference_date')
+    # Per-country model state, one row per country
+    countries = pd.DataFrame({
+        'last_actual_date': grp['reference_date'].last(),
+        'last_actual_value': grp['unemployment_rate_pct'].last(),
+        'min_training_samples': grp.size(),
         
-        # Get unemployment series
-        unemp_series = country_data.set_index('reference_date')['unemployment_rate_pct'].dropna()
-        
-        if len(unemp_series) < MIN_HISTORY_MONTHS:
-            continue
-        
-        # Get last date for forecast starting point
-        last_date = unemp_series.index.max()
-        last_value = unemp_series.iloc[-1]
-        
-        # Generate forecasts using different methods
         # 1. Exponential Smoothing
-        es_forecast = exponential_smoothing(unemp_series)
-        
-        # 2. Holt's Linear Trend
-        level, trend = holt_linear_trend(unemp_series)
-        
-        # 3. Linear Regression
-        lr_forecasts = linear_regression_forecast(unemp_series, FORECAST_HORIZON)
+        'es_forecast': exponential_smoothing(),
         
-        # Generate forecast rows
-        for i in range(FORECAST_HORIZON):
-            # Calculate forecast date
-            forecast_date = last_date + pd.DateOffset(months=i+1)
-            forecast_date = forecast_date.replace(day=1)  # First of month
-            
-            # Holt forecast for this horizon
-            holt_forecast = level + (i + 1) * trend
-            
-            # Ensemble forecast (average of methods)
-            methods_forecasts = [
-                es_forecast + i * trend,  # ES with trend adjustment
-                holt_forecast,
-                lr_forecasts[i]
-            ]
-            ensemble_forecast = np.nanmean(methods_forecasts)
-            
-            # Prediction interval
-            lower, upper = calculate_prediction_interval(
-                unemp_series, 
-                ensemble_forecast
-            )
-            
-            forecasts.append({
-                'country_code': country_code,
-                'forecast_date': forecast_date,
-                'forecast_horizon_months': i + 1,
-                'last_actual_date': last_date,
-                'last_actual_value': last_value,
-                'forecast_exp_smoothing': es_forecast + i * trend,
-                'forecast_holt': holt_forecast,
-                'forecast_linear_reg': lr_forecasts[i],
-                'forecast_ensemble': ensemble_forecast,
-                'prediction_interval_lower': lower,
-                'prediction_interval_upper': upper,
-                'forecast_generated_at': datetime.now(),
-                'model_version': '1.0.0',
-                'min_training_samples': len(unemp_series)
-            })
-    
-    # Create DataFrame
-    result_df = pd.DataFrame(forecasts)
+        'margin': prediction_interval_margin(),
+    })
+    
+    # 2. Holt's Linear Trend (a sequential recurrence, evaluated per country)
+    holt = pd.DataFrame(
+        [holt_linear_trend(series) for _, series in grp['unemployment_rate_pct']],
+        index=countries.index,
+        columns=['level', 'trend']
+    )
+    
+    # 3. Linear Regression
+    countries = countries.join(holt).join(linear_regression())
+    
+    # Expand to one row per country and forecast horizon
+    expanded = countries.loc[countries.index.repeat(FORECAST_HORIZON)]
+    horizon = np.tile(np.arange(1, FORECAST_HORIZON + 1), len(countries))
+    
+    # Forecast dates (first of month)
+    forecast_dates = (
+        pd.DatetimeIndex(expanded['last_actual_date']).to_period('M') + horizon
+    ).to_timestamp()
+    
+    holt_forecasts = expanded['level'].to_numpy() + horizon * expanded['trend'].to_numpy()
+    
+    # ES with trend adjustment
+    es_forecasts = expanded['es_forecast'].to_numpy() + (horizon - 1) * expanded['trend'].to_numpy()
+    
+    lr_forecasts = (
+        expanded['intercept'].to_numpy() +
+        expanded['slope'].to_numpy() * (expanded['min_training_samples'].to_numpy() - 1 + horizon)
+    )
+    
+    # Ensemble forecast (average of methods)
+    ensemble_forecasts = np.nanmean(
+        np.stack([es_forecasts, holt_forecasts, lr_forecasts]),
+        axis=0
+    )
+    
+    # Prediction interval
+    margin = expanded['margin'].to_numpy()
+    
+    result_df = pd.DataFrame({
+        'country_code': expanded.index.to_numpy(),
+        'forecast_date': forecast_dates,
+        'forecast_horizon_months': horizon,
+        'last_actual_date': expanded['last_actual_date'].to_numpy(),
+        'last_actual_value': expanded['last_actual_value'].to_numpy(),
+        'forecast_exp_smoothing': es_forecasts,
+        'forecast_holt': holt_forecasts,
+        'forecast_linear_reg': lr_forecasts,
+        'forecast_ensemble': ensemble_forecasts,
+        'prediction_interval_lower': ensemble_forecasts - margin,
+        'prediction_interval_upper': ensemble_forecasts + margin,
+        'forecast_generated_at': RUN_TIMESTAMP,
+        'model_version': '1.0.0',
+        'min_training_samples': expanded['min_training_samples'].to_numpy()
+    })
     
     # Add uncertainty quantification
     if len(result_df) > 0:
@@ -197,9 +199,13 @@ def model(dbt, session):
             result_df['prediction_interval_upper'] - 
             result_df['prediction_interval_lower']
         )
-        result_df['forecast_confidence'] = np.where(
-            result_df['prediction_interval_width'] < 1.0, 'high',
-            np.where(result_df['prediction_interval_width'] < 2.0, 'medium', 'low')
-        )
+        # Left-closed bins: < 1.0 is high, < 2.0 is medium, otherwise low;
+        # stored as plain strings so the column stays VARCHAR, not ENUM
+        result_df['forecast_confidence'] = pd.cut(
+            result_df['prediction_interval_width'],
+            bins=[-np.inf, 1.0, 2.0, np.inf],
+            labels=['high', 'medium', 'low'],
+            right=False
+        ).astype(str)
     
     return result_df
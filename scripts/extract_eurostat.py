@@ -15,14 +15,20 @@ Usage:
 """
 
 import argparse
-import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlencode
 
 import duckdb
+import numpy as np
+import orjson
+import pyarrow as pa
 import requests
+from requests.adapters import HTTPAdapter
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +43,7 @@ EUROSTAT_API_BASE = "https://ec.europa.eu/eurostat/api/dissemination/statistics/
 # Dataset configurations
 DATASETS = {
     "nama_10_gdp": {
+        "table": "gdp",
         "description": "GDP and main components",
         "params": {
             "unit": "CP_MEUR",  # Current prices, million euro
@@ -46,6 +53,7 @@ DATASETS = {
         "time_format": "annual",
     },
     "une_rt_m": {
+        "table": "unemployment",
         "description": "Unemployment rate",
         "params": {
             "s_adj": "SA",      # Seasonally adjusted
@@ -57,6 +65,7 @@ DATASETS = {
         "time_format": "monthly",
     },
     "prc_hicp_mmor": {
+        "table": "inflation",
         "description": "HICP - monthly data (rate of change)",
         "params": {
             "coicop": "CP00",   # All-items HICP
@@ -65,6 +74,7 @@ DATASETS = {
         "time_format": "monthly",
     },
     "demo_pjan": {
+        "table": "population",
         "description": "Population on 1 January",
         "params": {
             "sex": "T",         # Total
@@ -75,76 +85,121 @@ DATASETS = {
     },
 }
 
+# Shared HTTP session so parallel fetches reuse pooled keep-alive
+# connections (responses are gzip-compressed via Accept-Encoding)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_maxsize=len(DATASETS)))
 
-def fetch_eurostat_data(dataset_code: str, params: dict) -> dict[str, Any]:
+
+def build_query_params(params: dict) -> list[tuple[str, str]]:
+    """
+    Encode dataset filters as Eurostat query parameters.
+    
+    List values repeat the key (geo=DE&geo=FR...), as the API expects.
+    """
+    query_params = [("format", "JSON"), ("lang", "en")]
+    for key, value in params.items():
+        if isinstance(value, list):
+            query_params.extend((key, v) for v in value)
+        else:
+            query_params.append((key, value))
+    return query_params
+
+
+def query_hash(params: dict) -> str:
+    """Fingerprint of the encoded query, stored next to its HTTP validators."""
+    return hashlib.sha256(urlencode(build_query_params(params)).encode()).hexdigest()
+
+
+def fetch_eurostat_data(
+    dataset_code: str,
+    params: dict,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> tuple[dict[str, Any] | None, str | None, str | None]:
     """
     Fetch data from Eurostat JSON API.
     
     Args:
         dataset_code: Eurostat dataset identifier
         params: Query parameters for filtering
+        etag: ETag from the previous fetch, sent as If-None-Match
+        last_modified: Last-Modified from the previous fetch, sent as
+            If-Modified-Since
         
     Returns:
-        JSON response as dictionary
+        Tuple of (JSON response as dictionary, ETag, Last-Modified); the
+        response is None when the dataset is unchanged (HTTP 304)
     """
     url = f"{EUROSTAT_API_BASE}/{dataset_code}"
     
-    # Build query parameters
-    query_params = {"format": "JSON", "lang": "en"}
+    query_params = build_query_params(params)
     
-    for key, value in params.items():
-        if isinstance(value, list):
-            # Multiple values: repeat the parameter
-            for v in value:
-                if key in query_params:
-                    if isinstance(query_params[key], list):
-                        query_params[key].append(v)
-                    else:
-                        query_params[key] = [query_params[key], v]
-                else:
-                    query_params[key] = v
-        else:
-            query_params[key] = value
+    # Conditional request so unchanged datasets come back as an empty 304
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
     
     logger.info(f"Fetching {dataset_code} from Eurostat API...")
     
     try:
-        response = requests.get(url, params=query_params, timeout=60)
+        response = SESSION.get(url, params=query_params, headers=headers, timeout=60)
+        if response.status_code == 304:
+            return None, etag, last_modified
         response.raise_for_status()
-        return response.json()
+        # orjson parses multi-MB JSON-stat payloads far faster than stdlib json
+        return (
+            orjson.loads(response.content),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch {dataset_code}: {e}")
         raise
 
 
-def parse_eurostat_json(data: dict, dataset_code: str) -> list[dict]:
+def parse_eurostat_json(data: dict, dataset_code: str) -> dict[str, np.ndarray | pa.Array]:
     """
-    Parse Eurostat JSON-stat format into flat records.
+    Parse Eurostat JSON-stat format into flat columns.
     
     The JSON-stat format uses dimension indices to compress data.
-    We need to expand these into readable records.
+    We need to expand these into readable columns, one array per
+    output column (dataset_code, value, extracted_at, <dim>_code,
+    <dim>_label), all of equal length. Dimension columns are Arrow
+    dictionary arrays over the category codes and labels.
     """
-    records = []
-    
     # Get dimension information
     dimensions = data.get("dimension", {})
     dim_ids = data.get("id", [])
     dim_sizes = data.get("size", [])
     values = data.get("value", {})
+    # One extraction timestamp for the whole dataset
+    extracted_at = np.datetime64(datetime.utcnow(), "us")
     
-    # Build dimension label lookups
+    # Build dense code/label arrays indexed by category position
     dim_labels = {}
-    for dim_id in dim_ids:
+    for dim_id, size in zip(dim_ids, dim_sizes):
         dim_info = dimensions.get(dim_id, {})
         category = dim_info.get("category", {})
         index = category.get("index", {})
         label = category.get("label", {})
         
-        # Map index position to code and label
-        dim_labels[dim_id] = {
-            "codes": {v: k for k, v in index.items()},
-            "labels": label,
-        }
+        # JSON-stat allows the index as a plain list of codes
+        if isinstance(index, list):
+            index = {code: pos for pos, code in enumerate(index)}
+        
+        code_arr = [str(pos) for pos in range(size)]
+        for code, pos in index.items():
+            code_arr[pos] = code
+        label_arr = [label.get(code, code) for code in code_arr]
+        
+        # Arrow dictionaries: each distinct string is stored once
+        code_arr = pa.array(code_arr, type=pa.string())
+        label_arr = pa.array(label_arr, type=pa.string())
+        
+        dim_labels[dim_id] = {"codes": code_arr, "labels": label_arr}
     
     # Calculate strides for index computation
     strides = []
@@ -153,167 +208,124 @@ def parse_eurostat_json(data: dict, dataset_code: str) -> list[dict]:
         strides.insert(0, stride)
         stride *= size
     
-    # Iterate through all values
-    for flat_idx, value in values.items():
-        flat_idx = int(flat_idx)
-        record = {
-            "dataset_code": dataset_code,
-            "value": value,
-            "extracted_at": datetime.utcnow().isoformat(),
-        }
-        
-        # Decode each dimension
-        remaining = flat_idx
-        for i, dim_id in enumerate(dim_ids):
-            dim_idx = remaining // strides[i]
-            remaining = remaining % strides[i]
-            
-            code = dim_labels[dim_id]["codes"].get(dim_idx, str(dim_idx))
-            record[f"{dim_id}_code"] = code
-            record[f"{dim_id}_label"] = dim_labels[dim_id]["labels"].get(code, code)
+    # Drop null observations (flag-only cells) before decoding; staging
+    # filters them out anyway
+    flat_indices = np.fromiter(map(int, values.keys()), dtype=np.int64, count=len(values))
+    observations = np.array(list(values.values()), dtype=np.float64)
+    has_value = ~np.isnan(observations)
+    remaining = flat_indices[has_value]
+    observations = observations[has_value]
+    n_values = len(observations)
+    
+    # Decode all flat indices into a preallocated (dimension, record)
+    # position matrix, reusing the remainder buffer in place
+    positions = np.empty((len(strides), n_values), dtype=np.int32)
+    for i, stride in enumerate(strides):
+        np.divmod(remaining, stride, out=(positions[i], remaining))
+    
+    columns = {
+        "dataset_code": np.full(n_values, dataset_code, dtype=object),
+        "value": observations,
+        "extracted_at": np.full(n_values, extracted_at),
+    }
+    
+    # Dimension columns are dictionary-encoded over the decoded positions
+    for i, dim_id in enumerate(dim_ids):
+        indices = pa.array(positions[i])
+        codes = dim_labels[dim_id]["codes"]
+        labels = dim_labels[dim_id]["labels"]
         
-        records.append(record)
+        columns[f"{dim_id}_code"] = pa.DictionaryArray.from_arrays(indices, codes)
+        columns[f"{dim_id}_label"] = pa.DictionaryArray.from_arrays(indices, labels)
     
-    logger.info(f"Parsed {len(records)} records from {dataset_code}")
-    return records
+    logger.info(f"Parsed {n_values} records from {dataset_code}")
+    return columns
 
 
-def load_to_duckdb(records: list[dict], table_name: str, db_path: str, replace: bool = False):
+def load_to_duckdb(
+    columns: dict[str, np.ndarray | pa.Array],
+    table_name: str,
+    conn: duckdb.DuckDBPyConnection,
+    replace: bool = False,
+):
     """
-    Load records into DuckDB table.
+    Load columns into DuckDB table.
     
     Args:
-        records: List of record dictionaries
+        columns: Mapping of column name to equal-length value arrays
         table_name: Target table name
-        db_path: Path to DuckDB database file
-        replace: If True, replace existing table; otherwise append
+        conn: Open DuckDB connection; the caller owns the transaction
+        replace: If True, clear existing rows first; otherwise append
     """
-    if not records:
+    if len(columns["value"]) == 0:
         logger.warning(f"No records to load for {table_name}")
         return
     
-    # Ensure data directory exists
-    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    # Tables are declared up front by create_raw_tables
+    if replace:
+        conn.execute(f"TRUNCATE raw_{table_name}")
     
-    conn = duckdb.connect(db_path)
+    # Build a columnar Arrow table once and insert it with a single
+    # vectorized scan instead of one parameterized INSERT per row
+    column_names = list(columns)
+    arrow_table = pa.table({
+        # from_pandas maps NaN to NULL
+        col: values if isinstance(values, pa.Array) else pa.array(values, from_pandas=True)
+        for col, values in columns.items()
+    })
     
+    conn.register("arrow_view", arrow_table)
     try:
-        # Create table from records
-        if replace:
-            conn.execute(f"DROP TABLE IF EXISTS raw_{table_name}")
-        
-        # Use DuckDB's ability to infer schema from dicts
-        conn.execute(f"""
-            CREATE TABLE IF NOT EXISTS raw_{table_name} AS 
-            SELECT * FROM (VALUES {','.join(['(' + ','.join([f"'{v}'" if isinstance(v, str) else str(v) if v is not None else 'NULL' for v in r.values()]) + ')' for r in records[:1]])}) 
-            WHERE 1=0
-        """)
-        
-        # Insert records using parameterized query for safety
-        columns = list(records[0].keys())
-        placeholders = ",".join(["?" for _ in columns])
-        
-        conn.executemany(
-            f"INSERT INTO raw_{table_name} ({','.join(columns)}) VALUES ({placeholders})",
-            [tuple(r.get(c) for c in columns) for r in records]
+        column_list = ",".join(column_names)
+        conn.execute(
+            f"INSERT INTO raw_{table_name} ({column_list}) SELECT {column_list} FROM arrow_view"
         )
-        
-        row_count = conn.execute(f"SELECT COUNT(*) FROM raw_{table_name}").fetchone()[0]
-        logger.info(f"Loaded {row_count} total rows into raw_{table_name}")
-        
     finally:
-        conn.close()
+        conn.unregister("arrow_view")
+    
+    row_count = conn.execute(f"SELECT COUNT(*) FROM raw_{table_name}").fetchone()[0]
+    logger.info(f"Loaded {row_count} total rows into raw_{table_name}")
 
 
-def create_raw_tables(db_path: str):
+def create_raw_tables(conn: duckdb.DuckDBPyConnection):
     """
     Create raw tables with proper schema definitions.
-    """
-    conn = duckdb.connect(db_path)
     
-    try:
-        # GDP table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS raw_gdp (
-                dataset_code VARCHAR,
-                value DOUBLE,
-                extracted_at TIMESTAMP,
-                freq_code VARCHAR,
-                freq_label VARCHAR,
-                unit_code VARCHAR,
-                unit_label VARCHAR,
-                na_item_code VARCHAR,
-                na_item_label VARCHAR,
-                geo_code VARCHAR,
-                geo_label VARCHAR,
-                time_code VARCHAR,
-                time_label VARCHAR
-            )
-        """)
-        
-        # Unemployment table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS raw_unemployment (
-                dataset_code VARCHAR,
-                value DOUBLE,
-                extracted_at TIMESTAMP,
-                freq_code VARCHAR,
-                freq_label VARCHAR,
-                s_adj_code VARCHAR,
-                s_adj_label VARCHAR,
-                age_code VARCHAR,
-                age_label VARCHAR,
-                unit_code VARCHAR,
-                unit_label VARCHAR,
-                sex_code VARCHAR,
-                sex_label VARCHAR,
-                geo_code VARCHAR,
-                geo_label VARCHAR,
-                time_code VARCHAR,
-                time_label VARCHAR
-            )
-        """)
-        
-        # Inflation table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS raw_inflation (
-                dataset_code VARCHAR,
-                value DOUBLE,
-                extracted_at TIMESTAMP,
-                freq_code VARCHAR,
-                freq_label VARCHAR,
-                coicop_code VARCHAR,
-                coicop_label VARCHAR,
-                geo_code VARCHAR,
-                geo_label VARCHAR,
-                time_code VARCHAR,
-                time_label VARCHAR
-            )
-        """)
+    Each table has the fixed dataset_code/value/extracted_at columns plus
+    a code and label column per dimension: freq, the filtered dimensions
+    from the dataset params, then time.
+    """
+    for config in DATASETS.values():
+        dimensions = ["freq", *config["params"], "time"]
+        column_defs = [
+            "dataset_code VARCHAR",
+            "value DOUBLE",
+            "extracted_at TIMESTAMP",
+        ]
+        for dim_id in dimensions:
+            column_defs += [f"{dim_id}_code VARCHAR", f"{dim_id}_label VARCHAR"]
         
-        # Population table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS raw_population (
-                dataset_code VARCHAR,
-                value DOUBLE,
-                extracted_at TIMESTAMP,
-                freq_code VARCHAR,
-                freq_label VARCHAR,
-                sex_code VARCHAR,
-                sex_label VARCHAR,
-                age_code VARCHAR,
-                age_label VARCHAR,
-                geo_code VARCHAR,
-                geo_label VARCHAR,
-                time_code VARCHAR,
-                time_label VARCHAR
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS raw_{config["table"]} (
+                {", ".join(column_defs)}
             )
         """)
-        
-        logger.info("Raw tables created successfully")
-        
-    finally:
-        conn.close()
+    
+    # Conditional request validators from the last successful fetch (with
+    # the query they belong to), and when each dataset was last confirmed
+    # current (loaded or HTTP 304)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS raw_extract_meta (
+            dataset_code VARCHAR PRIMARY KEY,
+            query_hash VARCHAR,
+            etag VARCHAR,
+            last_modified VARCHAR,
+            fetched_at TIMESTAMP,
+            checked_at TIMESTAMP
+        )
+    """)
+    
+    logger.info("Raw tables created successfully")
 
 
 def extract_and_load(db_path: str, full_refresh: bool = False):
@@ -323,32 +335,82 @@ def extract_and_load(db_path: str, full_refresh: bool = False):
     # Ensure data directory exists
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     
-    # Create tables
-    create_raw_tables(db_path)
-    
-    # Table mapping
-    table_mapping = {
-        "nama_10_gdp": "gdp",
-        "une_rt_m": "unemployment",
-        "prc_hicp_mmor": "inflation",
-        "demo_pjan": "population",
-    }
-    
-    for dataset_code, config in DATASETS.items():
+    # One connection and one transaction for the whole run: a dataset that
+    # fails to fetch or parse is skipped, a failed load rolls everything back
+    with duckdb.connect(db_path) as conn:
+        conn.execute("BEGIN TRANSACTION")
         try:
-            # Fetch from API
-            data = fetch_eurostat_data(dataset_code, config["params"])
+            # Create tables
+            create_raw_tables(conn)
             
-            # Parse JSON-stat format
-            records = parse_eurostat_json(data, dataset_code)
+            # Validators from earlier runs, only reused for an identical query
+            # (changed params must refetch); a full refresh always refetches
+            query_hashes = {
+                dataset_code: query_hash(config["params"])
+                for dataset_code, config in DATASETS.items()
+            }
+            cached = {}
+            if not full_refresh:
+                cached = {
+                    dataset_code: (etag, last_modified)
+                    for dataset_code, stored_hash, etag, last_modified in conn.execute(
+                        "SELECT dataset_code, query_hash, etag, last_modified FROM raw_extract_meta"
+                    ).fetchall()
+                    if stored_hash == query_hashes.get(dataset_code)
+                }
             
-            # Load to DuckDB
-            table_name = table_mapping.get(dataset_code, dataset_code)
-            load_to_duckdb(records, table_name, db_path, replace=full_refresh)
+            # Fetch all datasets concurrently; the API round trips dominate runtime
+            with ThreadPoolExecutor(max_workers=len(DATASETS)) as executor:
+                futures = {
+                    executor.submit(
+                        fetch_eurostat_data,
+                        dataset_code,
+                        config["params"],
+                        *cached.get(dataset_code, (None, None)),
+                    ): dataset_code
+                    for dataset_code, config in DATASETS.items()
+                }
+                
+                # Parse and load on this thread as responses arrive (DuckDB has a
+                # single writer)
+                for future in as_completed(futures):
+                    dataset_code = futures[future]
+                    try:
+                        data, etag, last_modified = future.result()
+                        
+                        # Parse JSON-stat format; no data means unchanged (HTTP 304)
+                        columns = parse_eurostat_json(data, dataset_code) if data is not None else None
+                        
+                    except Exception as e:
+                        logger.error(f"Failed to process {dataset_code}: {e}")
+                        continue
+                    
+                    checked_at = datetime.utcnow()
+                    if columns is None:
+                        # Record the check so source freshness still sees the
+                        # dataset as current
+                        logger.info(f"{dataset_code} unchanged since last extract, skipping load")
+                        conn.execute(
+                            "UPDATE raw_extract_meta SET checked_at = ? WHERE dataset_code = ?",
+                            [checked_at, dataset_code],
+                        )
+                        continue
+                    
+                    # Load to DuckDB
+                    table_name = DATASETS[dataset_code]["table"]
+                    load_to_duckdb(columns, table_name, conn, replace=full_refresh)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO raw_extract_meta VALUES (?, ?, ?, ?, ?, ?)",
+                        [
+                            dataset_code, query_hashes[dataset_code],
+                            etag, last_modified, checked_at, checked_at,
+                        ],
+                    )
             
-        except Exception as e:
-            logger.error(f"Failed to process {dataset_code}: {e}")
-            continue
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
     
     logger.info("Extraction complete!")
 